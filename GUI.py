@@ -20,7 +20,7 @@ class GUI(ABC):
 
     @abstractmethod
     def put_object(self, obj: Object) -> None:
-        """Makes a deep copy of the object and displays it on the canvas
+        """Makes a copy of the object and displays it on the canvas
 
         Args:
             obj: An Object instance to be displayed
@@ -59,6 +59,47 @@ class GUI(ABC):
     def draw_canvas_polygon(self, xy_list, e_color, f_color) -> None:
         pass
 
+    @abstractmethod
+    def draw_canvas_points(self, xy_list, v_color) -> None:
+        """Draws a point for every (x, y) pair in xy_list, replacing the points drawn by the previous call
+
+        Prefer this over draw_canvas_point when drawing many points since it avoids the per-call overhead and
+        implementations may move the previous frame's points instead of recreating them.
+
+        Args:
+            xy_list: A list of (x, y) canvas coordinates, one per point.
+            v_color: The color shared by all points.
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def draw_canvas_polygons(self, xy_lists, e_color, f_colors) -> None:
+        """Draws a polygon for every flat coordinates list in xy_lists, replacing the previous call's polygons
+
+        Polygons are stacked in the order of xy_lists, the last one being on top.
+
+        Args:
+            xy_lists: A list of flat coordinate lists [x1, y1, x2, y2, ...], one per polygon.
+            e_color: The edge color shared by all polygons.
+            f_colors: A list of fill colors, one per polygon.
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def draw_canvas_image(self, rgb) -> None:
+        """Draws an image at the top left corner of the canvas, replacing the image drawn by the previous call
+
+        Args:
+            rgb: An HxWx3 uint8 numpy array, usually of the same size as the canvas.
+        Returns:
+            None
+        """
+        pass
+
     @abstractmethod
     def clear_canvas(self) -> None:
         """Clears the current object from the canvas
@@ -71,8 +112,9 @@ class GUI(ABC):
         pass
 
     def redraw_canvas(self) -> None:
-        """Del"""
-        obj = self.obj
-        self.clear_canvas()
-        self.renderer.render_object(obj)
-        self.obj = obj
+        """Renders the current object again, e.g. after it was rotated or the canvas was resized.
+
+        The canvas is not cleared so that the batch drawing functions can update the previous frame in place.
+        """
+        if self.obj is not None:
+            self.renderer.render_object(self.obj)
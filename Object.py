@@ -6,13 +6,19 @@ Typical usage example:
 
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, Object.rotate falls back to numpy when it is missing.
+    njit = None
+
 
 class Object:
     """Represents any 3D object as a triangular mesh.
 
     Attributes:
-        vertices: An Nx3 numpy matrix where each row represents the (x,y,z) coordinates.
-        faces: a list of tuples where each tuple contains the 3 indices into the vertices list that constitute a face.
+        vertices: An Nx3 contiguous float32 numpy matrix where each row represents the (x,y,z) coordinates.
+        faces: An Fx3 numpy integer matrix where each row contains the 3 indices into the vertices that constitute a
+            face.
     """
 
     def __init__(self, vertices, faces):
@@ -22,9 +28,21 @@ class Object:
             vertices: a list of tuples where each tuple is in the form (x,y,z) to specifying a vertex.
             Alternatively, you can pass an Nx3 numpy matrix where each row represents the (x,y,z) coordinates.
             faces: a list of tuples where each tuple contains 3 indices into the vertices list that constitute a face.
+            Alternatively, you can pass an Fx3 numpy integer matrix.
+
+        Raises:
+            ValueError: if a face does not have exactly 3 indices.
         """
-        self.vertices = np.array(vertices)
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        faces = np.asarray(faces, dtype=np.int32)
+        if faces.size == 0:
+            faces = faces.reshape(0, 3)
+        elif faces.ndim != 2 or faces.shape[1] != 3:
+            raise ValueError("Only triangular faces are supported.")
         self.faces = faces
+        # Buffers reused by rotate() so that dragging does not allocate on every frame.
+        self._rot_mat = np.empty((3, 3), dtype=np.float32)
+        self._vertices_tmp = None
 
     def normalize(self):
         """Offsets and scales the object such that all vertices are within [-1, 1]
@@ -51,12 +69,57 @@ class Object:
         Returns:
             None
         """
-        a, b, r = yaw, pitch, roll
-        cos = np.cos
-        sin = np.sin
-        rot_mat = np.array([
-            [cos(a)*cos(b), cos(a)*sin(b)*sin(r)-sin(a)*cos(r), cos(a)*sin(b)*cos(r)+sin(a)*sin(r)],
-            [sin(a)*cos(b), sin(a)*sin(b)*sin(r)+cos(a)*cos(r), sin(a)*sin(b)*cos(r)-cos(a)*sin(r)],
-            [-sin(b), cos(b)*sin(r), cos(b)*cos(r)]
-        ])
-        self.vertices = self.vertices @ rot_mat
\ No newline at end of file
+        ca, sa = np.cos(yaw), np.sin(yaw)
+        cb, sb = np.cos(pitch), np.sin(pitch)
+        cr, sr = np.cos(roll), np.sin(roll)
+
+        rot_mat = self._rot_mat
+        rot_mat[0, 0] = ca*cb
+        rot_mat[0, 1] = ca*sb*sr - sa*cr
+        rot_mat[0, 2] = ca*sb*cr + sa*sr
+        rot_mat[1, 0] = sa*cb
+        rot_mat[1, 1] = sa*sb*sr + ca*cr
+        rot_mat[1, 2] = sa*sb*cr - ca*sr
+        rot_mat[2, 0] = -sb
+        rot_mat[2, 1] = cb*sr
+        rot_mat[2, 2] = cb*cr
+
+        if njit is not None:
+            _rotate_inplace(self.vertices, rot_mat)
+            return
+
+        out_dtype = np.result_type(self.vertices, rot_mat)
+        if self._vertices_tmp is None or self._vertices_tmp.shape != self.vertices.shape \
+                or self._vertices_tmp.dtype != out_dtype:
+            self._vertices_tmp = np.empty(self.vertices.shape, dtype=out_dtype)
+
+        # Write the result into the spare buffer and swap it with the current vertices.
+        np.dot(self.vertices, rot_mat, out=self._vertices_tmp)
+        self.vertices, self._vertices_tmp = self._vertices_tmp, self.vertices
+
+
+def _rotate_inplace(vertices, rot_mat):
+    """Computes vertices @ rot_mat in place, one vertex at a time.
+
+    Compiled with numba when available so that dragging avoids the numpy dispatch and temporary buffers. The GIL is
+    released while it runs.
+
+    Args:
+        vertices: An Nx3 numpy matrix that will be overwritten.
+        rot_mat: A 3x3 rotation matrix.
+
+    Returns:
+        None
+    """
+    m00, m01, m02 = rot_mat[0, 0], rot_mat[0, 1], rot_mat[0, 2]
+    m10, m11, m12 = rot_mat[1, 0], rot_mat[1, 1], rot_mat[1, 2]
+    m20, m21, m22 = rot_mat[2, 0], rot_mat[2, 1], rot_mat[2, 2]
+    for i in range(vertices.shape[0]):
+        x, y, z = vertices[i, 0], vertices[i, 1], vertices[i, 2]
+        vertices[i, 0] = x*m00 + y*m10 + z*m20
+        vertices[i, 1] = x*m01 + y*m11 + z*m21
+        vertices[i, 2] = x*m02 + y*m12 + z*m22
+
+
+if njit is not None:
+    _rotate_inplace = njit(cache=True, fastmath=True, nogil=True)(_rotate_inplace)
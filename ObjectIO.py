@@ -18,6 +18,8 @@ Typical usage example:
     obj = load_object_neo("object.txt")
 """
 
+import numpy as np
+
 from Object import Object
 
 
@@ -53,20 +55,28 @@ def load_object_neo(file_path) -> Object:
 
     Raises:
         OSError: if file_path was not reachable.
+        ValueError: if the vertex IDs are not exactly 1 to the number of vertices or faces are missing.
     """
     with open(file_path) as f:
         n_vertices, n_faces = [int(x) for x in f.readline().split(",")]
-
-        vertices = [None] * n_vertices
-        faces = [None] * n_faces
-
-        for i in range(n_vertices):
-            v_id, x, y, z = [float(x) for x in f.readline().split(",")]
-            vertices[int(v_id) - 1] = (x, y, z)
-
-        for j in range(n_faces):
-            v_id1, v_id2, v_id3 = [int(x)-1 for x in f.readline().split(",")]
-            faces[j] = (v_id1, v_id2, v_id3)
+        vertex_rows = np.empty((0, 4))
+        faces = np.empty((0, 3), dtype=np.int32)
+        # loadtxt warns about empty input, so empty sections are not read at all.
+        if n_vertices > 0:
+            vertex_rows = np.loadtxt(f, delimiter=",", max_rows=n_vertices, ndmin=2)
+        if n_faces > 0:
+            faces = np.loadtxt(f, delimiter=",", max_rows=n_faces, dtype=np.int32, ndmin=2) - 1
+
+    # loadtxt stops quietly at the end of the file, so a truncated face section has to be caught here.
+    if len(faces) != n_faces:
+        raise ValueError(f"Expected {n_faces} faces but found {len(faces)}.")
+
+    # Vertices are placed by their ID rather than by their order in the file, so every ID must appear exactly once.
+    v_ids = vertex_rows[:, 0].astype(np.int64)
+    if not np.array_equal(np.sort(v_ids), np.arange(1, n_vertices + 1)):
+        raise ValueError(f"Vertex IDs must be unique and range from 1 to {n_vertices}.")
+    vertices = np.empty((n_vertices, 3), dtype=np.float32)
+    vertices[v_ids - 1] = vertex_rows[:, 1:]
 
     return Object(vertices, faces)
 
@@ -86,10 +96,10 @@ def save_object_neo(file_path, obj: Object) -> None:
     """
     with open(file_path, "w") as f:
         f.write(f"{len(obj.vertices)},{len(obj.faces)}\n")
-        for i,v in enumerate(obj.vertices):
-            f.write(f"{i+1},{','.join([str(x) for x in v])}\n")
-        for face in obj.faces:
-            f.write(f"{','.join([str(x+1) for x in face])}\n")
+        v_ids = np.arange(1, len(obj.vertices) + 1)
+        # 9 significant digits are enough to round trip float32 coordinates.
+        np.savetxt(f, np.column_stack([v_ids, obj.vertices]), fmt="%d,%.9g,%.9g,%.9g")
+        np.savetxt(f, obj.faces + 1, fmt="%d,%d,%d")
 
 
 def load_object_obj(file_path) -> Object:
@@ -103,16 +113,28 @@ def load_object_obj(file_path) -> Object:
 
     Raises:
         OSError: if file_path was not reachable.
+        ValueError: if a vertex has fewer than 3 coordinates or a face is not a triangle.
     """
-    vertices = list()
-    faces = list()
     with open(file_path) as f:
-        for l in f.readlines():
-            tokens = l.split(" ")
-            if tokens[0] == "v":
-                vertices.append([float(x) for x in tokens[1:]])
-            if tokens[0] == "f":
-                faces.append([int(x)-1 for x in tokens[1:]])
+        lines = f.read().splitlines()
+
+    v_lines = [l[2:] for l in lines if l.startswith("v ")]
+    f_lines = [l[2:] for l in lines if l.startswith("f ")]
+
+    # Join the values of each section into one string so numpy can parse it in a single call.
+    vertices = np.fromstring(" ".join(v_lines), dtype=np.float32, sep=" ")
+    if vertices.size != 3 * len(v_lines):
+        # Only the x, y, z coordinates are kept, the format allows an optional w and per vertex colors after them.
+        v_rows = [l.split()[:3] for l in v_lines]
+        if any(len(row) != 3 for row in v_rows):
+            raise ValueError("Every vertex must have x, y and z coordinates.")
+        vertices = np.array(v_rows, dtype=np.float32)
+    vertices = vertices.reshape(-1, 3)
+
+    faces = np.fromstring(" ".join(f_lines), dtype=np.int32, sep=" ")
+    if faces.size != 3 * len(f_lines):
+        raise ValueError("Only triangular faces are supported.")
+    faces = faces.reshape(-1, 3) - 1
 
     return Object(vertices, faces)
 
@@ -131,7 +153,5 @@ def save_object_obj(file_path, obj: Object) -> None:
         OSError: if file_path included non-existent directories or if the directory was not writable.
     """
     with open(file_path, "w") as f:
-        for v in obj.vertices:
-            f.write(f"v {' '.join([str(x) for x in v])}\n")
-        for face in obj.faces:
-            f.write(f"f {' '.join([str(x+1) for x in face])}\n")
\ No newline at end of file
+        np.savetxt(f, obj.vertices, fmt="v %.9g %.9g %.9g")
+        np.savetxt(f, obj.faces + 1, fmt="f %d %d %d")
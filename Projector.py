@@ -1,5 +1,7 @@
 """Includes the Projector interface as well as all of its implementations"""
 
+import numpy as np
+
 from abc import ABC, abstractmethod
 
 
@@ -18,6 +20,17 @@ class Projector(ABC):
         """
         pass
 
+    def get_matrix(self):
+        """Returns the linear map of the projection if it has one
+
+        Renderers can fold this matrix together with scaling into a single matrix multiplication.
+
+        Returns:
+            A 3x2 numpy matrix M such that project(vertices) equals vertices @ M, or None if the projection is not
+            linear.
+        """
+        return None
+
 
 class OrthographicProjector(Projector):
     """Implements orthographic projection
@@ -34,6 +47,10 @@ class OrthographicProjector(Projector):
 
         return vertices[:, :2]
 
+    def get_matrix(self):
+        """See base class"""
+        return np.eye(3)[:, :2]
+
 
 class PerspectiveProjector(Projector):
     def project(self, vertices):
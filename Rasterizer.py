@@ -0,0 +1,231 @@
+"""Contains functions that rasterize triangles, lines and points into numpy pixel buffers
+
+Triangles are filled using Pineda's edge functions: a pixel is inside a triangle when it lies on the inner side of
+all three edges, and the normalized edge function values double as the barycentric coordinates used to interpolate
+the depth. A z-buffer keeps the closest face of every pixel, which also handles intersecting faces.
+
+Typical usage example:
+    zbuf = np.full((h, w), np.inf, dtype=np.float32)
+    cbuf = np.full((h, w, 3), 255, dtype=np.uint8)
+    rasterize_triangles(vertices_2d, depths, faces, face_colors, zbuf, cbuf)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, rasterize_triangles falls back to numpy when it is missing.
+    njit = None
+    prange = range
+
+
+def rasterize_triangles(vertices_2d, depths, faces, face_colors, zbuf, cbuf) -> None:
+    """Draws flat colored triangles into the color buffer keeping only the closest triangle of each pixel.
+
+    Pixel (x, y) is sampled at its integer coordinates. Smaller depths are closer to the viewer.
+
+    Args:
+        vertices_2d: An Nx2 numpy matrix of canvas coordinates.
+        depths: An N numpy vector containing the depth of every vertex.
+        faces: An Fx3 numpy integer matrix of indices into vertices_2d.
+        face_colors: An Fx3 uint8 numpy matrix containing the RGB color of every face.
+        zbuf: An HxW float32 numpy matrix containing the depth of every pixel. Updated in place.
+        cbuf: An HxWx3 uint8 numpy array containing the color of every pixel. Updated in place.
+
+    Returns:
+        None
+    """
+    vertices_2d = np.ascontiguousarray(vertices_2d, dtype=np.float32)
+    depths = np.ascontiguousarray(depths, dtype=np.float32)
+    faces = np.ascontiguousarray(faces, dtype=np.int32)
+    face_colors = np.ascontiguousarray(face_colors, dtype=np.uint8)
+
+    if njit is not None:
+        _rasterize_kernel(vertices_2d, depths, faces, face_colors, zbuf, cbuf)
+    else:
+        _rasterize_numpy(vertices_2d, depths, faces, face_colors, zbuf, cbuf)
+
+
+# Height in pixels of the horizontal bands processed in parallel. Each band is owned by a single thread so the
+# depth test needs no atomics.
+_BAND_HEIGHT = 16
+
+
+def _rasterize_kernel(vertices_2d, depths, faces, face_colors, zbuf, cbuf):
+    """Pixel by pixel implementation of rasterize_triangles, compiled with numba when available.
+
+    The canvas is split into horizontal bands that are rasterized in parallel. Within a row the edge functions are
+    evaluated once and then updated incrementally, adding a constant step per pixel.
+    """
+    h, w = zbuf.shape
+    n_bands = (h + _BAND_HEIGHT - 1) // _BAND_HEIGHT
+    for band in prange(n_bands):
+        band_min_y = band * _BAND_HEIGHT
+        band_max_y = min(band_min_y + _BAND_HEIGHT, h) - 1
+        for f in range(faces.shape[0]):
+            i0, i1, i2 = faces[f, 0], faces[f, 1], faces[f, 2]
+            x0, y0 = np.float64(vertices_2d[i0, 0]), np.float64(vertices_2d[i0, 1])
+            x1, y1 = np.float64(vertices_2d[i1, 0]), np.float64(vertices_2d[i1, 1])
+            x2, y2 = np.float64(vertices_2d[i2, 0]), np.float64(vertices_2d[i2, 1])
+
+            min_y = max(int(np.ceil(min(y0, y1, y2))), band_min_y)
+            max_y = min(int(np.floor(max(y0, y1, y2))), band_max_y)
+            if min_y > max_y:
+                continue
+            area = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+            if area == 0:
+                continue
+            min_x = max(int(np.ceil(min(x0, x1, x2))), 0)
+            max_x = min(int(np.floor(max(x0, x1, x2))), w - 1)
+
+            # Dividing by the signed area makes the weights positive inside the triangle for both windings.
+            inv_area = 1 / area
+            dw0_dx = -(y2 - y1) * inv_area
+            dw1_dx = -(y0 - y2) * inv_area
+            dw2_dx = -(y1 - y0) * inv_area
+            z0, z1, z2 = depths[i0], depths[i1], depths[i2]
+            r, g, b = face_colors[f, 0], face_colors[f, 1], face_colors[f, 2]
+            for py in range(min_y, max_y + 1):
+                w0 = ((x2 - x1) * (py - y1) - (y2 - y1) * (min_x - x1)) * inv_area
+                w1 = ((x0 - x2) * (py - y2) - (y0 - y2) * (min_x - x2)) * inv_area
+                w2 = ((x1 - x0) * (py - y0) - (y1 - y0) * (min_x - x0)) * inv_area
+                for px in range(min_x, max_x + 1):
+                    if w0 >= 0 and w1 >= 0 and w2 >= 0:
+                        z = w0 * z0 + w1 * z1 + w2 * z2
+                        if z < zbuf[py, px]:
+                            zbuf[py, px] = z
+                            cbuf[py, px, 0] = r
+                            cbuf[py, px, 1] = g
+                            cbuf[py, px, 2] = b
+                    w0 += dw0_dx
+                    w1 += dw1_dx
+                    w2 += dw2_dx
+
+
+if njit is not None:
+    # fastmath without the no-NaN/no-Inf assumptions since the depth buffer is initialized to infinity. The GIL is
+    # released so that frames rasterized on a worker thread do not stall the GUI thread.
+    _rasterize_kernel = njit(parallel=True, cache=True, nogil=True,
+                             fastmath={"contract", "arcp", "nsz", "reassoc"})(_rasterize_kernel)
+
+
+def _rasterize_numpy(vertices_2d, depths, faces, face_colors, zbuf, cbuf):
+    """Implementation of rasterize_triangles that vectorizes over the bounding box of each triangle."""
+    h, w = zbuf.shape
+    for f, (i0, i1, i2) in enumerate(faces.tolist()):
+        (x0, y0), (x1, y1), (x2, y2) = vertices_2d[[i0, i1, i2]].tolist()
+        area = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+        if area == 0:
+            continue
+
+        min_x = max(int(np.ceil(min(x0, x1, x2))), 0)
+        max_x = min(int(np.floor(max(x0, x1, x2))), w - 1)
+        min_y = max(int(np.ceil(min(y0, y1, y2))), 0)
+        max_y = min(int(np.floor(max(y0, y1, y2))), h - 1)
+        if min_x > max_x or min_y > max_y:
+            continue
+
+        px = np.arange(min_x, max_x + 1, dtype=np.float32)[np.newaxis, :]
+        py = np.arange(min_y, max_y + 1, dtype=np.float32)[:, np.newaxis]
+        w0 = ((x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)) / area
+        w1 = ((x0 - x2) * (py - y2) - (y0 - y2) * (px - x2)) / area
+        w2 = ((x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)) / area
+        z = w0 * depths[i0] + w1 * depths[i1] + w2 * depths[i2]
+
+        zbuf_box = zbuf[min_y:max_y + 1, min_x:max_x + 1]
+        closer = (w0 >= 0) & (w1 >= 0) & (w2 >= 0) & (z < zbuf_box)
+        zbuf_box[closer] = z[closer]
+        cbuf[min_y:max_y + 1, min_x:max_x + 1][closer] = face_colors[f]
+
+
+def rasterize_lines(vertices_2d, edges, color, cbuf) -> None:
+    """Draws one pixel wide lines into the color buffer.
+
+    Args:
+        vertices_2d: An Nx2 numpy matrix of canvas coordinates.
+        edges: An Ex2 numpy integer matrix of indices into vertices_2d, one row per line.
+        color: The RGB color of the lines.
+        cbuf: An HxWx3 uint8 numpy array containing the color of every pixel. Updated in place.
+
+    Returns:
+        None
+    """
+    vertices_2d = np.rint(vertices_2d).astype(np.int32)
+    edges = np.ascontiguousarray(edges, dtype=np.int32)
+    color = np.asarray(color, dtype=np.uint8)
+
+    if njit is not None:
+        _bresenham_kernel(vertices_2d, edges, color, cbuf)
+    else:
+        _lines_numpy(vertices_2d, edges, color, cbuf)
+
+
+def rasterize_points(vertices_2d, radius, color, cbuf) -> None:
+    """Stamps a filled disk of the given radius centered at every vertex into the color buffer.
+
+    Args:
+        vertices_2d: An Nx2 numpy matrix of canvas coordinates.
+        radius: The radius of the disks in pixels.
+        color: The RGB color of the disks.
+        cbuf: An HxWx3 uint8 numpy array containing the color of every pixel. Updated in place.
+
+    Returns:
+        None
+    """
+    h, w, _ = cbuf.shape
+    centers = np.rint(vertices_2d).astype(np.int32)
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    in_disk = dx**2 + dy**2 <= radius**2
+    xs = (centers[:, 0, np.newaxis] + dx[in_disk]).ravel()
+    ys = (centers[:, 1, np.newaxis] + dy[in_disk]).ravel()
+    on_canvas = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+    cbuf[ys[on_canvas], xs[on_canvas]] = color
+
+
+def _bresenham_kernel(vertices_2d, edges, color, cbuf):
+    """Bresenham implementation of rasterize_lines, compiled with numba when available."""
+    h, w, _ = cbuf.shape
+    for e in range(edges.shape[0]):
+        x, y = vertices_2d[edges[e, 0], 0], vertices_2d[edges[e, 0], 1]
+        x_end, y_end = vertices_2d[edges[e, 1], 0], vertices_2d[edges[e, 1], 1]
+        dx = abs(x_end - x)
+        dy = -abs(y_end - y)
+        step_x = 1 if x < x_end else -1
+        step_y = 1 if y < y_end else -1
+        err = dx + dy
+        while True:
+            if 0 <= x < w and 0 <= y < h:
+                cbuf[y, x, 0] = color[0]
+                cbuf[y, x, 1] = color[1]
+                cbuf[y, x, 2] = color[2]
+            if x == x_end and y == y_end:
+                break
+            err2 = 2 * err
+            if err2 >= dy:
+                err += dy
+                x += step_x
+            if err2 <= dx:
+                err += dx
+                y += step_y
+
+
+if njit is not None:
+    _bresenham_kernel = njit(cache=True, nogil=True)(_bresenham_kernel)
+
+
+def _lines_numpy(vertices_2d, edges, color, cbuf):
+    """Implementation of rasterize_lines that samples every line once per pixel along its major axis."""
+    h, w, _ = cbuf.shape
+    starts = vertices_2d[edges[:, 0]]
+    deltas = vertices_2d[edges[:, 1]] - starts
+    n_steps = np.abs(deltas).max(axis=1)
+
+    # Sample i of a line sits at start + delta * i / n_steps for i in [0, n_steps].
+    line_ids = np.repeat(np.arange(len(edges)), n_steps + 1)
+    first_sample = np.cumsum(n_steps + 1) - (n_steps + 1)
+    i = np.arange(len(line_ids)) - first_sample[line_ids]
+    t = i / np.maximum(n_steps[line_ids], 1)
+    xs = np.rint(starts[line_ids, 0] + deltas[line_ids, 0] * t).astype(np.int64)
+    ys = np.rint(starts[line_ids, 1] + deltas[line_ids, 1] * t).astype(np.int64)
+    on_canvas = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+    cbuf[ys[on_canvas], xs[on_canvas]] = color
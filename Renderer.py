@@ -5,6 +5,7 @@ import numpy as np
 from abc import ABC, abstractmethod
 from Projector import Projector
 from Object import Object
+from Rasterizer import rasterize_triangles, rasterize_lines, rasterize_points
 
 
 class Renderer(ABC):
@@ -18,8 +19,14 @@ class Renderer(ABC):
     def __init__(self, projector: Projector,  gui=None):
         self.projector = projector
         self.gui = gui
+        # The view transform only depends on the canvas size and the projector so it is cached between frames.
+        self._view_key = None
+        self._view_scale = None
+        self._view_offset = None
+        self._view_mtx = None
+        # Canvas coordinates are projected into this buffer, which is reused while the number of vertices is unchanged.
+        self._vertices_2d = None
 
-    @abstractmethod
     def render_object(self, obj: Object) -> None:
         """Uses the GUI drawing functions to translate the 3D object into 2D points, lines, and polygons.
 
@@ -28,8 +35,66 @@ class Renderer(ABC):
         Returns:
             None
         """
+        assert self.gui is not None
+        self.draw_frame(self.prepare_frame(obj, self.gui.get_canvas_size()))
+
+    @abstractmethod
+    def prepare_frame(self, obj: Object, canvas_size):
+        """Does all the computation of render_object without calling the GUI.
+
+        Can run on a worker thread, as long as calls on the same renderer do not overlap. The returned frame does not
+        reference the renderer's buffers, so it stays valid while the next frame is prepared.
+
+        Args:
+            obj: The 3D object to render
+            canvas_size: The (width, height) of the canvas
+        Returns:
+            A frame to be passed to draw_frame
+        """
+        pass
+
+    @abstractmethod
+    def draw_frame(self, frame) -> None:
+        """Draws a frame returned by prepare_frame using the GUI drawing functions.
+
+        Args:
+            frame: The frame to draw
+        Returns:
+            None
+        """
         pass
 
+    def _project_to_canvas(self, vertices, canvas_size):
+        """Projects the vertices onto the canvas such that the object occupies approximately half of the canvas size.
+
+        When the projector is linear, the projection, scaling and shifting are fused into one matrix multiplication.
+        The transform is only recomputed when the canvas size, the projector or the vertex dtype changes.
+
+        Args:
+            vertices: A numpy Nx3 matrix of normalized vertices
+            canvas_size: The (width, height) of the canvas
+        Returns:
+            Nx2 numpy matrix of canvas coordinates, overwritten by the next call
+        """
+        w, h = canvas_size
+        view_key = (w, h, self.projector, vertices.dtype)
+        if view_key != self._view_key:
+            self._view_key = view_key
+            self._view_scale = min(w, h) * 0.35
+            self._view_offset = np.array([w/2, h/2, 0], dtype=vertices.dtype)
+            proj_mat = self.projector.get_matrix()
+            self._view_mtx = None if proj_mat is None else (proj_mat * self._view_scale).astype(vertices.dtype)
+
+        if self._view_mtx is None:
+            return self.projector.project(vertices*self._view_scale + self._view_offset)
+
+        if self._vertices_2d is None or self._vertices_2d.shape != (len(vertices), 2) \
+                or self._vertices_2d.dtype != vertices.dtype:
+            self._vertices_2d = np.empty((len(vertices), 2), dtype=vertices.dtype)
+        vertices_2d = np.matmul(vertices, self._view_mtx, out=self._vertices_2d)
+        vertices_2d += self._view_offset[:2]
+        return vertices_2d
+
 
 class WireframeRenderer(Renderer):
     """Renders objects in wireframe
@@ -45,31 +110,75 @@ class WireframeRenderer(Renderer):
         self.vertices_color = "#0000FF"
         self.edges_color = "#0000FF"
 
-    def render_object(self, obj: Object) -> None:
-        """Renders objects in wireframe (See base class)
+    def prepare_frame(self, obj: Object, canvas_size):
+        """Computes the wireframe of the object (See base class)
 
         The object is normalized, shifted and scaled such that it occupies approximately half of the canvas size.
+
+        Returns:
+            A (points, polygons) tuple of coordinate lists for the GUI batch drawing functions.
         """
-        assert self.gui is not None
+        vertices_2d = np.rint(self._project_to_canvas(obj.vertices, canvas_size)).astype(np.int32)
+        polygons = vertices_2d[obj.faces].reshape(len(obj.faces), 6).tolist()
+        return vertices_2d.tolist(), polygons
 
-        w, h = self.gui.get_canvas_size()
-        vertices = obj.vertices*np.min([w, h])*0.35 + np.array([w/2, h/2, 0])
+    def draw_frame(self, frame) -> None:
+        """See base class"""
+        points, polygons = frame
+        self.gui.draw_canvas_points(points, v_color=self.vertices_color)
+        self.gui.draw_canvas_polygons(polygons,
+                                      e_color=self.edges_color,
+                                      f_colors=[""] * len(polygons))
+
+
+class RasterWireframeRenderer(WireframeRenderer):
+    """Renders objects in wireframe into a pixel buffer
+
+    Lines and vertex dots are drawn into a numpy image that is handed to the GUI as a single image, so a frame costs
+    one GUI call regardless of the number of edges. Edges shared by two faces are drawn once.
+
+    Attributes (See base class for more attributes):
+        background_color: RGB tuple used for pixels not covered by the object.
+    """
+
+    def __init__(self, projector: Projector,  gui=None):
+        """initializes renderer with blue colors on a white background"""
+        super().__init__(projector, gui)
+        self.background_color = (255, 255, 255)
+        self._edges = None
+        self._edges_src = None
+
+    def prepare_frame(self, obj: Object, canvas_size):
+        """Rasterizes the wireframe of the object (See base class)
+
+        The object is normalized, shifted and scaled such that it occupies approximately half of the canvas size.
+
+        Returns:
+            An HxWx3 uint8 numpy image of the whole canvas.
+        """
+        w, h = canvas_size
+        vertices_2d = self._project_to_canvas(obj.vertices, canvas_size)
 
-        self.gui.clear_canvas()
+        cbuf = np.empty((h, w, 3), dtype=np.uint8)
+        cbuf[:] = self.background_color
+        rasterize_lines(vertices_2d, self._get_edges(obj), _hex_to_rgb(self.edges_color), cbuf)
+        rasterize_points(vertices_2d, 3, _hex_to_rgb(self.vertices_color), cbuf)
+        return cbuf
 
-        vertices_2d = self.projector.project(vertices)
-        for x, y in vertices_2d:
-            self.gui.draw_canvas_point(x, y, v_color=self.vertices_color)
+    def draw_frame(self, frame) -> None:
+        """See base class"""
+        self.gui.draw_canvas_image(frame)
 
-        for face in obj.faces:
-            face_vertices = list()
-            for v_id in face:
-                face_vertices.extend(vertices_2d[v_id])
+    def _get_edges(self, obj: Object):
+        """Returns the unique edges of the object's faces as an Ex2 numpy matrix.
 
-            self.gui.draw_canvas_polygon(face_vertices,
-                                         e_color=self.edges_color,
-                                         f_color="")
-        self.gui.obj = obj
+        The edges are only recomputed when the object's faces array changes.
+        """
+        if self._edges_src is not obj.faces:
+            self._edges_src = obj.faces
+            edges = np.concatenate([obj.faces[:, [0, 1]], obj.faces[:, [1, 2]], obj.faces[:, [2, 0]]])
+            self._edges = np.unique(np.sort(edges, axis=1), axis=0)
+        return self._edges
 
 
 class FlatShadedRenderer(Renderer):
@@ -77,57 +186,78 @@ class FlatShadedRenderer(Renderer):
 
     The renderer uses the simple painter's algorithm.
     Cannot render objects with intersecting faces properly.
-    Can be slow since it renders all of the non-visible polygons as well. TODO: Implement back face culling
+    Faces pointing away from the viewer are culled when the object is a closed mesh with consistent winding.
+    Other objects are rendered with all of their faces since their normals cannot tell front from back.
 
     Attributes (See base class for more attributes):
         vertices_color
         edges_color
         bright_face_color: Color of faces parallel to the screen
         dark_face_color: Color of faces orthogonal to the screen
+        cull_back_faces: Whether to skip faces pointing away from the viewer when possible.
     """
     def __init__(self, projector: Projector,  gui=None):
         """initializes renderer with blue colors"""
         super().__init__(projector, gui)
         self.vertices_color = "#0000FF"
         self.edges_color = "#0000FF"
-        self.bright_face_color = "#0000FF"
-        self.dark_face_color = "#00005F"
-
-    def render_object(self, obj: Object) -> None:
-        """Renders flat shaded objects (See base class)
+        self._bright_face_color = "#0000FF"
+        self._dark_face_color = "#00005F"
+        self._color_lut = self._build_color_lut()
+        self.cull_back_faces = True
+        self._winding_obj = None
+        self._front_sign = 0
+
+    @property
+    def bright_face_color(self) -> str:
+        return self._bright_face_color
+
+    @bright_face_color.setter
+    def bright_face_color(self, color) -> None:
+        self._bright_face_color = color
+        self._color_lut = self._build_color_lut()
+
+    @property
+    def dark_face_color(self) -> str:
+        return self._dark_face_color
+
+    @dark_face_color.setter
+    def dark_face_color(self, color) -> None:
+        self._dark_face_color = color
+        self._color_lut = self._build_color_lut()
+
+    def prepare_frame(self, obj: Object, canvas_size):
+        """Sorts the object's faces and computes their shading (See base class)
 
         The object is normalized, shifted and scaled such that it occupies approximately half of the canvas size.
-        """
-        assert self.gui is not None
-
-        w, h = self.gui.get_canvas_size()
-        vertices = obj.vertices*np.min([w, h])*0.35 + np.array([w/2, h/2, 0])
 
+        Returns:
+            A (points, polygons, colors) tuple of coordinate and color lists for the GUI batch drawing functions.
+        """
         self._sort_obj_faces_by_depth(obj)
-        self.gui.clear_canvas()
-
-        vertices_2d = self.projector.project(vertices)
-        for x, y in vertices_2d:
-            self.gui.draw_canvas_point(x, y, v_color=self.vertices_color)
-
-        for face in obj.faces:
-            P1, P2, P3 = [vertices[face[i]] for i in range(3)]
-            U = P2 - P1
-            V = P3 - P1
-            N = np.cross(U, V)
-            N /= np.linalg.norm(N)
-            norm_z_axis_component = np.abs(N[2])
-            color_hex = self._color_fader(self.bright_face_color, self.dark_face_color, norm_z_axis_component)
-
-            face_vertices = list()
-            for v_id in face:
-                face_vertices.extend(vertices_2d[v_id])
-
-            self.gui.draw_canvas_polygon(face_vertices,
-                                         e_color=self.edges_color,
-                                         f_color=color_hex)
-
-        self.gui.obj = obj
+        vertices_2d = np.rint(self._project_to_canvas(obj.vertices, canvas_size)).astype(np.int32)
+
+        faces = obj.faces
+        normals = self._face_normals(obj.vertices, faces)
+        if self.cull_back_faces:
+            front_sign = self._front_facing_sign(obj)
+            if front_sign != 0:
+                visible = normals[:, 2] * front_sign > 0
+                faces = faces[visible]
+                normals = normals[visible]
+
+        lut = self._color_lut
+        colors = [lut[i] for i in (np.abs(normals[:, 2]) * 255).astype(np.int32).tolist()]
+        polygons = vertices_2d[faces].reshape(len(faces), 6).tolist()
+        return vertices_2d.tolist(), polygons, colors
+
+    def draw_frame(self, frame) -> None:
+        """See base class"""
+        points, polygons, colors = frame
+        self.gui.draw_canvas_points(points, v_color=self.vertices_color)
+        self.gui.draw_canvas_polygons(polygons,
+                                      e_color=self.edges_color,
+                                      f_colors=colors)
 
     def _sort_obj_faces_by_depth(self, obj: Object) -> None:
         """Sorts the renderer object's faces inplace based on the average z value
@@ -140,18 +270,68 @@ class FlatShadedRenderer(Renderer):
         Returns:
             None
         """
-        depth_face_ls = list()
-        for face in obj.faces:
-            z_avg = 0
-            for v_id in face:
-                x, y, z = obj.vertices[v_id]
-                z_avg += z
-            z_avg /= 3
-            depth_face_ls.append((z_avg, face))
-        depth_face_ls = sorted(depth_face_ls, key=lambda x: x[0], reverse=True)
-        obj.faces.clear()
-        for z_avg, face in depth_face_ls:
-            obj.faces.append(face)
+        z_avg = obj.vertices[obj.faces, 2].mean(axis=1)
+        order = np.argsort(-z_avg, kind="stable")
+        obj.faces[:] = obj.faces[order]
+
+    def _front_facing_sign(self, obj: Object) -> int:
+        """Finds which sign the z component of a face normal has when the face points towards the viewer
+
+        Only closed meshes where every edge is shared by two faces with opposite winding can be culled. Their
+        orientation is given by the sign of their signed volume. Rotating does not change the result, so it is
+        computed once per object.
+
+        Args:
+            obj: The Object instance being rendered
+
+        Returns:
+            1 or -1 for cullable meshes, 0 if back faces cannot be told apart.
+        """
+        if obj is self._winding_obj:
+            return self._front_sign
+        self._winding_obj = obj
+        self._front_sign = 0
+
+        faces = obj.faces.astype(np.int64)
+        n_vertices = len(obj.vertices)
+        edge_starts = faces.ravel()
+        edge_ends = faces[:, [1, 2, 0]].ravel()
+        edges = edge_starts * n_vertices + edge_ends
+        reversed_edges = edge_ends * n_vertices + edge_starts
+        if len(faces) == 0 or len(np.unique(edges)) != len(edges) or not np.isin(reversed_edges, edges).all():
+            return self._front_sign
+
+        P = obj.vertices[obj.faces].astype(np.float64)
+        volume = np.einsum("ij,ij->", P[:, 0], np.cross(P[:, 1], P[:, 2]))
+        # The viewer looks towards +z, so outward normals of visible faces have a negative z component.
+        self._front_sign = -int(np.sign(volume))
+        return self._front_sign
+
+    @staticmethod
+    def _face_normals(vertices, faces):
+        """Computes the unit normal of every face at once
+
+        The normal is the cross product of two edges of the face. Degenerate faces get a zero normal.
+
+        Args:
+            vertices: An Nx3 numpy matrix of vertices
+            faces: An Fx3 numpy matrix of indices into vertices
+
+        Returns:
+            An Fx3 numpy matrix where each row is the normal of the corresponding face.
+        """
+        P = vertices[faces]
+        N = np.cross(P[:, 1] - P[:, 0], P[:, 2] - P[:, 0])
+        norms = np.linalg.norm(N, axis=1, keepdims=True)
+        return np.divide(N, norms, out=np.zeros_like(N), where=norms > 0)
+
+    def _build_color_lut(self) -> list:
+        """Precomputes the face colors for 256 evenly spaced alpha values in [0, 1]
+
+        Returns:
+            A list of 256 hex strings where entry i is the bright and dark face colors faded with alpha i/255.
+        """
+        return [self._color_fader(self._bright_face_color, self._dark_face_color, i / 255) for i in range(256)]
 
     def _color_fader(self, color1, color2, alpha) -> str:
         """ Fades the color from color1 to color2 based on alpha as color1*alpha + (1-alpha)*color2
@@ -169,4 +349,66 @@ class FlatShadedRenderer(Renderer):
         c2_rgb = hex2rgb(color2)
         c3_rgb = c1_rgb * alpha + c2_rgb * (1-alpha)
         c3_hex = '#{:02x}{:02x}{:02x}'.format(*[int(x) for x in c3_rgb])
-        return c3_hex
\ No newline at end of file
+        return c3_hex
+
+
+class ZBufferRenderer(FlatShadedRenderer):
+    """Renders flat shaded objects into a pixel buffer using a z-buffer
+
+    Unlike the painter's algorithm, intersecting faces are rendered properly and no sorting is needed. The whole
+    frame is handed to the GUI as a single image, which is much faster than one canvas item per face on large meshes.
+    Vertices and edges are not drawn so vertices_color and edges_color are unused.
+
+    Attributes (See base class for more attributes):
+        background_color: RGB tuple used for pixels not covered by the object.
+    """
+    def __init__(self, projector: Projector,  gui=None):
+        """initializes renderer with blue colors on a white background"""
+        super().__init__(projector, gui)
+        self.background_color = (255, 255, 255)
+        self._rgb_lut = None
+        self._rgb_lut_src = None
+
+    def prepare_frame(self, obj: Object, canvas_size):
+        """Rasterizes the shaded faces of the object (See base class)
+
+        The object is normalized, shifted and scaled such that it occupies approximately half of the canvas size.
+
+        Returns:
+            An HxWx3 uint8 numpy image of the whole canvas.
+        """
+        w, h = canvas_size
+        vertices_2d = self._project_to_canvas(obj.vertices, canvas_size)
+
+        faces = obj.faces
+        normals = self._face_normals(obj.vertices, faces)
+        if self.cull_back_faces:
+            front_sign = self._front_facing_sign(obj)
+            if front_sign != 0:
+                visible = normals[:, 2] * front_sign > 0
+                faces = faces[visible]
+                normals = normals[visible]
+
+        face_colors = self._get_rgb_lut()[(np.abs(normals[:, 2]) * 255).astype(np.int32)]
+
+        zbuf = np.full((h, w), np.inf, dtype=np.float32)
+        cbuf = np.empty((h, w, 3), dtype=np.uint8)
+        cbuf[:] = self.background_color
+        rasterize_triangles(vertices_2d, obj.vertices[:, 2], faces, face_colors, zbuf, cbuf)
+        return cbuf
+
+    def draw_frame(self, frame) -> None:
+        """See base class"""
+        self.gui.draw_canvas_image(frame)
+
+    def _get_rgb_lut(self):
+        """Returns the color lookup table as a 256x3 uint8 numpy matrix, converting it again if the colors changed."""
+        if self._rgb_lut_src is not self._color_lut:
+            self._rgb_lut_src = self._color_lut
+            self._rgb_lut = np.array([_hex_to_rgb(c) for c in self._color_lut], dtype=np.uint8)
+        return self._rgb_lut
+
+
+def _hex_to_rgb(color) -> tuple:
+    """Converts a hex color string such as "#0000FF" to an (r, g, b) tuple of ints."""
+    return tuple(int(color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4))
@@ -5,16 +5,25 @@ Typical usage example:
     gui.wait()
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import copy
 import numpy as np
 
+try:
+    from PIL import Image, ImageTk
+except ImportError:  # pillow is optional, draw_canvas_image falls back to encoding a PPM image when it is missing.
+    ImageTk = None
+
 from GUI import GUI
 from Object import Object
 from Renderer import Renderer
 from ObjectIO import load_object, save_object
 
+# How often the tkinter thread checks whether the worker has finished the frame in flight.
+_POLL_INTERVAL_MS = 2
+
 
 class TkinterGUI(GUI):
     """An implementation of the GUI abstract class using the Tkinter library.
@@ -48,10 +57,38 @@ class TkinterGUI(GUI):
 
         self._dragging = False
         self._dragging_last = None
+        self._pending_dx = 0
+        self._pending_dy = 0
+        self._poll_scheduled = False
+
+        # Drag frames are rotated and prepared by the renderer on a worker thread so that the event loop only issues
+        # tkinter calls. At most one frame is in flight and mouse motion accumulates meanwhile. The worker rotates its
+        # own copy of the vertices into a back buffer that is then swapped with the displayed vertices, and the
+        # previous front buffer becomes the next back buffer. The lock keeps the worker and redraw_canvas from using
+        # the renderer at the same time.
+        self._frame_requests = queue.Queue(maxsize=1)
+        self._frames = queue.Queue(maxsize=1)
+        self._frame_in_flight = False
+        self._spare_vertices = None
+        self._render_lock = threading.Lock()
+        threading.Thread(target=self._frame_worker, daemon=True).start()
+
+        # Updated by the <Configure> handler so that rendering does not query tkinter for the size every frame.
+        self._canvas_size = None
+
+        # Canvas items drawn by the batch drawing functions as [item_id, fill, visible] entries, kept across frames
+        # so that redrawing only moves them.
+        self._point_items = list()
+        self._polygon_items = list()
+        self._polygon_outline = None
+        # The image shown by draw_canvas_image must be referenced or tkinter garbage collects it.
+        self._image_item = None
+        self._photo_image = None
 
     def put_object(self, obj: Object) -> None:
         """See base class"""
-        self.obj = copy.deepcopy(obj)
+        self.clear_canvas()
+        self.obj = Object(obj.vertices.copy(), obj.faces.copy())
         self.obj.normalize()
         # Flip y-coordinates to match the tkinter coordinate scheme so that increasing y in for an object vertex
         # corresponds to an upward direction in the 2D projection.
@@ -64,11 +101,16 @@ class TkinterGUI(GUI):
 
     def get_canvas_size(self) -> (int, int):
         """See base class"""
-        return self.canvas.winfo_width(), self.canvas.winfo_height()
+        if self._canvas_size is None:
+            return self.canvas.winfo_width(), self.canvas.winfo_height()
+        return self._canvas_size
 
     def draw_canvas_point(self, x, y, v_color) -> None:
-        """See base class"""
-        self.canvas.create_oval(x-3, y-3, x+3, y+3, fill=v_color)
+        """See base class
+
+        Points are drawn as small squares since tkinter rectangles are much cheaper than ovals.
+        """
+        self.canvas.create_rectangle(x-3, y-3, x+3, y+3, fill=v_color)
 
     def draw_canvas_line(self, x1, y1, x2, y2, e_color) -> None:
         """See base class"""
@@ -78,9 +120,102 @@ class TkinterGUI(GUI):
         """See base class"""
         self.canvas.create_polygon(xy_list, outline=e_color, fill=f_color, width=2)
 
+    def draw_canvas_points(self, xy_list, v_color) -> None:
+        """See base class
+
+        Points are drawn as small squares, see draw_canvas_point.
+        """
+        create_rectangle = self.canvas.create_rectangle
+        self._update_items(self._point_items,
+                           [(x-3, y-3, x+3, y+3) for x, y in xy_list],
+                           [v_color] * len(xy_list),
+                           lambda xy, fill: create_rectangle(xy, fill=fill))
+
+    def draw_canvas_polygons(self, xy_lists, e_color, f_colors) -> None:
+        """See base class"""
+        if e_color != self._polygon_outline:
+            for item in self._polygon_items:
+                self.canvas.delete(item[0])
+            self._polygon_items.clear()
+            self._polygon_outline = e_color
+
+        create_polygon = self.canvas.create_polygon
+        self._update_items(self._polygon_items, xy_lists, f_colors,
+                           lambda xy, fill: create_polygon(xy, outline=e_color, fill=fill, width=2))
+
+    def draw_canvas_image(self, rgb) -> None:
+        """See base class
+
+        With pillow, the photo image and its canvas item persist across frames and each frame is pasted into them.
+        """
+        h, w, _ = rgb.shape
+        if ImageTk is not None:
+            image = Image.fromarray(np.ascontiguousarray(rgb, dtype=np.uint8))
+            if self._photo_image is not None and (self._photo_image.width(), self._photo_image.height()) == (w, h):
+                self._photo_image.paste(image)
+                return
+            self._photo_image = ImageTk.PhotoImage(image)
+        else:
+            ppm = b"P6\n%d %d\n255\n" % (w, h) + np.ascontiguousarray(rgb, dtype=np.uint8).tobytes()
+            self._photo_image = tk.PhotoImage(width=w, height=h, data=ppm, format="PPM")
+
+        if self._image_item is None:
+            self._image_item = self.canvas.create_image(0, 0, anchor=tk.NW, image=self._photo_image)
+        else:
+            self.canvas.itemconfigure(self._image_item, image=self._photo_image)
+
+    def _update_items(self, items, xy_lists, fills, create_item) -> None:
+        """Moves the canvas items of the previous frame to their new coordinates instead of recreating them.
+
+        Items are only created when the previous frame had fewer of them, and surplus items are hidden.
+
+        Args:
+            items: A list of [item_id, fill, visible] entries that is updated in place.
+            xy_lists: The flat coordinates of every item in this frame.
+            fills: The fill color of every item in this frame.
+            create_item: A function taking flat coordinates and a fill color that creates an item and returns its id.
+        Returns:
+            None
+        """
+        coords = self.canvas.coords
+        itemconfigure = self.canvas.itemconfigure
+        n_items = len(items)
+        n_drawn = 0
+        for xy, fill in zip(xy_lists, fills):
+            if n_drawn < n_items:
+                item = items[n_drawn]
+                coords(item[0], xy)
+                if item[1] != fill or not item[2]:
+                    itemconfigure(item[0], fill=fill, state=tk.NORMAL)
+                    item[1] = fill
+                    item[2] = True
+            else:
+                items.append([create_item(xy, fill), fill, True])
+            n_drawn += 1
+
+        for item in items[n_drawn:]:
+            if item[2]:
+                itemconfigure(item[0], state=tk.HIDDEN)
+                item[2] = False
+
+    def redraw_canvas(self) -> None:
+        """See base class
+
+        The frame is prepared under the lock shared with the drag worker, which uses the same renderer.
+        """
+        if self.obj is not None:
+            canvas_size = self.get_canvas_size()
+            with self._render_lock:
+                frame = self.renderer.prepare_frame(self.obj, canvas_size)
+            self.renderer.draw_frame(frame)
+
     def clear_canvas(self) -> None:
         """See base class"""
         self.canvas.delete("all")
+        self._point_items.clear()
+        self._polygon_items.clear()
+        self._image_item = None
+        self._photo_image = None
         self.obj = None
 
     def _draw_axes(self):
@@ -94,6 +229,7 @@ class TkinterGUI(GUI):
 
     def _redraw_handler(self, event):
         """Handler called when the canvas is resized."""
+        self._canvas_size = (event.width, event.height)
         self.redraw_canvas()
 
     def _on_click_handler(self, event):
@@ -104,19 +240,102 @@ class TkinterGUI(GUI):
     def _on_move_handler(self, event):
         """Handler called when a mouse drags on the canvas
 
-        This is where the rotation of the object in response to the dragging happens.
+        The motion is accumulated here and turned into a rotation of the object by _request_frame. Motion that
+        arrives while a frame is in flight is rotated together in the next frame.
         """
         if self._dragging:
             x_last, y_last = self._dragging_last
-            delta_x = event.x - x_last
-            norm_delta_x = delta_x/self.canvas.winfo_width() * np.pi * 2
-            delta_y = event.y - y_last
-            norm_delta_y = delta_y/self.canvas.winfo_height() * np.pi * 2
+            self._pending_dx += event.x - x_last
+            self._pending_dy += event.y - y_last
             self._dragging_last = (event.x, event.y)
 
-            self.obj.rotate(0, norm_delta_x, -norm_delta_y)
+            if not self._frame_in_flight:
+                self._request_frame()
+
+    def _request_frame(self):
+        """Hands the mouse motion accumulated so far to the worker, which rotates the object and prepares the frame."""
+        if self.obj is None:
+            self._pending_dx = 0
+            self._pending_dy = 0
+            return
+        if not (self._pending_dx or self._pending_dy):
+            return
+
+        w, h = canvas_size = self.get_canvas_size()
+        norm_delta_x = self._pending_dx/w * np.pi * 2
+        norm_delta_y = self._pending_dy/h * np.pi * 2
+        self._pending_dx = 0
+        self._pending_dy = 0
+
+        back_buffer = self._spare_vertices
+        if back_buffer is None or back_buffer.shape != self.obj.vertices.shape \
+                or back_buffer.dtype != self.obj.vertices.dtype:
+            back_buffer = np.empty_like(self.obj.vertices)
+        self._spare_vertices = None
+        self._frame_requests.put((self.obj, 0, norm_delta_x, -norm_delta_y, canvas_size, back_buffer))
+        self._frame_in_flight = True
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.root.after(_POLL_INTERVAL_MS, self._poll_frame)
+
+    def _poll_frame(self):
+        """Displays the frame prepared by the worker once it is done, polling again until then.
+
+        The motion accumulated meanwhile is handed to the worker before drawing, so that the next frame is prepared
+        while this one is drawn.
+        """
+        self._poll_scheduled = False
+        try:
+            obj, vertices, canvas_size, frame = self._frames.get_nowait()
+        except queue.Empty:
+            self._poll_scheduled = True
+            self.root.after(_POLL_INTERVAL_MS, self._poll_frame)
+            return
+
+        self._frame_in_flight = False
+        if isinstance(vertices, Exception):
+            # Re-raised here so that tkinter reports it like any other callback error.
+            raise vertices
+        if obj is not self.obj:
+            # The object was replaced or cleared while the frame was in flight.
+            self._request_frame()
+            return
+
+        self._spare_vertices, obj.vertices = obj.vertices, vertices
+        self._request_frame()
+        if canvas_size == self.get_canvas_size():
+            self.renderer.draw_frame(frame)
+        else:
+            # The canvas was resized while the frame was in flight.
             self.redraw_canvas()
 
+    def _frame_worker(self):
+        """Body of the frame worker thread. Must not call tkinter.
+
+        Keeps its own copy of the displayed object. It stays in sync because the displayed vertices are only ever
+        replaced by the frames produced here, and it is recreated whenever a different object is put in. The faces are
+        copied too since the painter's algorithm reorders them.
+        Errors are posted back in place of the frame so that the thread keeps running and the tkinter thread reports
+        them.
+        """
+        source = None
+        worker_obj = None
+        while True:
+            obj, yaw, pitch, roll, canvas_size, back_buffer = self._frame_requests.get()
+            try:
+                if obj is not source:
+                    worker_obj = Object(obj.vertices.copy(), obj.faces.copy())
+                    source = obj
+                worker_obj.rotate(yaw, pitch, roll)
+                with self._render_lock:
+                    frame = self.renderer.prepare_frame(worker_obj, canvas_size)
+                np.copyto(back_buffer, worker_obj.vertices)
+                self._frames.put((obj, back_buffer, canvas_size, frame))
+            except Exception as e:
+                # The private copy may be half rotated, so it is rebuilt from the displayed vertices next time.
+                source = None
+                self._frames.put((obj, e, canvas_size, None))
+
     def _on_release_handler(self, event):
         """Handler called when a mouse releases from the canvas"""
         self._dragging = False
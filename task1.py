@@ -3,16 +3,18 @@ import argparse
 from ObjectIO import load_object
 from TkinterGUI import TkinterGUI
 from Projector import OrthographicProjector
-from Renderer import WireframeRenderer
+from Renderer import WireframeRenderer, RasterWireframeRenderer
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog='[Redacted] Software Assessment')
     parser.add_argument("-f", "--filepath", type=str, default="sample_objects/object.txt",
                         help="Specify the 3D object file to open. Otherwise the default object.txt is opened")
+    parser.add_argument("-r", "--raster", action="store_true",
+                        help="Draw the wireframe into a single image instead of canvas items. Faster on large meshes")
     args = parser.parse_args()
 
     projector = OrthographicProjector()
-    renderer = WireframeRenderer(projector)
+    renderer = RasterWireframeRenderer(projector) if args.raster else WireframeRenderer(projector)
     gui = TkinterGUI(renderer)
     obj = load_object(args.filepath)
     gui.put_object(obj)
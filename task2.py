@@ -3,16 +3,18 @@ import argparse
 from ObjectIO import load_object
 from TkinterGUI import TkinterGUI
 from Projector import OrthographicProjector
-from Renderer import FlatShadedRenderer
+from Renderer import FlatShadedRenderer, ZBufferRenderer
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog='[Redacted] Software Assessment')
     parser.add_argument("-f", "--filepath", type=str, default="sample_objects/object.txt",
                         help="Specify the 3D object file to open. Otherwise the default object.txt is opened")
+    parser.add_argument("-z", "--zbuffer", action="store_true",
+                        help="Render with a z-buffer instead of the painter's algorithm. Faster on large meshes")
     args = parser.parse_args()
 
     projector = OrthographicProjector()
-    renderer = FlatShadedRenderer(projector)
+    renderer = ZBufferRenderer(projector) if args.zbuffer else FlatShadedRenderer(projector)
     gui = TkinterGUI(renderer)
     obj = load_object(args.filepath)
     gui.put_object(obj)